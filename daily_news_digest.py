@@ -7,20 +7,32 @@ Simple daily news collector -> summarizer -> email sender.
 from dotenv import load_dotenv
 import os
 import time
+import hashlib
+import functools
 import sqlite3
 import smtplib
 import textwrap
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from email.mime.text import MIMEText
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import aiohttp
 import feedparser
-from newspaper import Article
+from bs4 import BeautifulSoup
+import trafilatura
+from trafilatura.metadata import extract_metadata
 import requests, json
+from requests.adapters import HTTPAdapter
 
 
 # Optional: local transformers
 USE_LOCAL_MODEL = False  # set True to use local summarizer (transformers)
 # If USE_LOCAL_MODEL True, install: pip install transformers torch sentencepiece
+QUANTIZE_LOCAL_MODEL = True  # int8 dynamic quantization on CPU, fp16 on GPU
 
 # If using Hugging Face Inference API, set HF_API_TOKEN
 USE_HF_API = not USE_LOCAL_MODEL
@@ -29,6 +41,7 @@ load_dotenv()  # load .env if present
 
 HF_API_TOKEN = os.environ.get("HF_API_TOKEN")
 HF_SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"  # or any other HF summarization model
+HF_API_URL = f"https://router.huggingface.co/hf-inference/models/{HF_SUMMARIZER_MODEL}"
 
 # SMTP / delivery config
 SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.gmail.com")
@@ -73,11 +86,27 @@ FEEDS = {
 # Summarization constraints
 MAX_ARTICLES_PER_CATEGORY = 5
 SUMMARY_MAX_TOKENS = 120
+SENT_URL_LOOKBACK_DAYS = 30  # how far back sent URLs are loaded for dedup
+FEED_CONTENT_MIN_CHARS = 1500  # in-feed body long enough to skip downloading the page
+
+# Network concurrency
+FETCH_CONCURRENCY = 32     # in-flight feed/article downloads
+MAX_REQUESTS_PER_HOST = 2  # politeness: concurrent downloads per host
+HOST_MIN_INTERVAL = 1.0    # politeness: seconds between article requests to one host
+HF_BATCH_SIZE = 8   # texts per HF Inference API request
+HF_CONCURRENCY = 2  # batched HF requests in flight
+
+# Opt-in: parse feed XML in worker processes. Only worth it for very large feeds;
+# for the handful of feeds above, process startup and pickling outweigh the gain.
+PARSE_FEEDS_IN_PROCESSES = False
+PARSE_WORKERS = 2
 
 
 def init_db():
     conn = sqlite3.connect(DB_PATH)
     c = conn.cursor()
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
     c.execute("""
         CREATE TABLE IF NOT EXISTS sent_articles (
             id INTEGER PRIMARY KEY,
@@ -86,102 +115,291 @@ def init_db():
             date_sent TEXT
         )
     """)
+    c.execute("CREATE INDEX IF NOT EXISTS idx_sent_articles_date ON sent_articles (date_sent)")
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS summary_cache (
+            text_sha256 TEXT PRIMARY KEY,
+            summary TEXT
+        )
+    """)
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS feed_meta (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB
+        )
+    """)
     conn.commit()
     return conn
 
-def mark_sent(conn, url, title):
+def mark_sent(conn, items: List[Tuple[str, str]], now_iso: str):
+    # items: (url, title) pairs; the caller commits
     c = conn.cursor()
-    c.execute("INSERT OR IGNORE INTO sent_articles (url, title, date_sent) VALUES (?, ?, ?)",
-              (url, title, datetime.now().isoformat()))
-    conn.commit()
+    c.executemany("INSERT OR IGNORE INTO sent_articles (url, title, date_sent) VALUES (?, ?, ?)",
+                  [(url, title, now_iso) for url, title in items])
 
-def was_sent(conn, url) -> bool:
+def load_sent_urls(conn) -> set:
+    # Recent URLs only, to bound memory; was_sent checks older history on a miss
+    c = conn.cursor()
+    c.execute("SELECT url FROM sent_articles WHERE date_sent > date('now', ?)",
+              (f"-{SENT_URL_LOOKBACK_DAYS} day",))
+    return {row[0] for row in c.fetchall()}
+
+def was_sent(conn, url: str, sent_urls: set) -> bool:
+    # Fast path: URLs sent recently or picked earlier in this run
+    if url in sent_urls:
+        return True
     c = conn.cursor()
     c.execute("SELECT 1 FROM sent_articles WHERE url = ? LIMIT 1", (url,))
-    return c.fetchone() is not None
+    if c.fetchone() is not None:
+        sent_urls.add(url)
+        return True
+    return False
+
+def load_feed_meta(conn) -> dict:
+    c = conn.cursor()
+    c.execute("SELECT url, etag, last_modified, body FROM feed_meta")
+    return {url: {"etag": etag, "last_modified": last_modified, "body": body}
+            for url, etag, last_modified, body in c.fetchall()}
+
+def save_feed_meta(conn, items: List[Tuple[str, dict]]):
+    # items: (feed_url, meta) pairs; the caller commits
+    c = conn.cursor()
+    c.executemany("INSERT OR REPLACE INTO feed_meta (url, etag, last_modified, body) VALUES (?, ?, ?, ?)",
+                  [(url, m["etag"], m["last_modified"], m["body"]) for url, m in items])
+
+def text_hash(text: str) -> str:
+    # Normalize whitespace/case so trivially different copies share a cache entry
+    normalized = " ".join(text.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def get_cached_summaries(conn, hashes: List[str]) -> dict:
+    c = conn.cursor()
+    cached = {}
+    for h in set(hashes):
+        c.execute("SELECT summary FROM summary_cache WHERE text_sha256 = ?", (h,))
+        row = c.fetchone()
+        if row is not None:
+            cached[h] = row[0]
+    return cached
+
+def cache_summaries(conn, items: List[Tuple[str, str]]):
+    # items: (text_sha256, summary) pairs; the caller commits
+    c = conn.cursor()
+    c.executemany("INSERT OR REPLACE INTO summary_cache (text_sha256, summary) VALUES (?, ?)", items)
 
 # ---- Fetch & extract ----
-def fetch_feed_entries(feed_url: str, timeout: int = 15) -> List[dict]:
+# Downloads run on one event loop with a shared aiohttp connection pool;
+# parsing is offloaded to an executor so it doesn't block the loop (feed XML can
+# optionally go to a process pool, see PARSE_FEEDS_IN_PROCESSES).
+def make_parse_pool() -> Optional[Executor]:
+    if not PARSE_FEEDS_IN_PROCESSES:
+        return None  # default thread executor
+    # forkserver: never fork the event-loop process, which already runs resolver threads
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                               mp_context=multiprocessing.get_context("forkserver"))
+
+def parse_feed(body: bytes) -> List[dict]:
+    # Feedparser can parse from string
+    d = feedparser.parse(body)
+    return d.entries if hasattr(d, "entries") else []
+
+async def fetch_feed(session: aiohttp.ClientSession, feed_url: str, meta: Optional[dict] = None,
+                     timeout: int = 15,
+                     parse_executor: Optional[Executor] = None) -> Tuple[List[dict], Optional[dict]]:
+    # Conditional GET: returns (entries, new_meta); new_meta is None when nothing changed
+    headers = {}
+    if meta and meta.get("body"):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
     try:
-        resp = requests.get(feed_url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
-        if "xml" not in resp.headers.get("Content-Type",""):
-            print(f"Skipping non-RSS feed: {feed_url}")
-            return []
-        # Feedparser can parse from string
-        d = feedparser.parse(resp.content)
-        entries = d.entries if hasattr(d, "entries") else []
-        return entries
-    except requests.exceptions.RequestException as e:
-        print(f"[fetch_feed_entries] Request failed: {e}")
-        return []
-
-def extract_article_text(url: str) -> Tuple[str,str]:
+        async with session.get(feed_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            status = resp.status
+            content_type = resp.headers.get("Content-Type", "")
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            body = await resp.read() if status != 304 else b""
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"[fetch_feed] Request failed: {e}")
+        return [], None
+
+    loop = asyncio.get_running_loop()
+    if status == 304:
+        return await loop.run_in_executor(parse_executor, parse_feed, meta["body"]), None
+    if "xml" not in content_type:
+        print(f"Skipping non-RSS feed: {feed_url}")
+        return [], None
+    entries = await loop.run_in_executor(parse_executor, parse_feed, body)
+    if status != 200 or not (etag or last_modified):
+        # Error pages and feeds without validators aren't worth caching
+        return entries, None
+    return entries, {"etag": etag, "last_modified": last_modified, "body": body}
+
+_host_next_slot: Dict[str, float] = {}
+
+async def wait_for_host(url: str):
+    # Per-host spacing: only requests to the same site wait on each other
+    host = urlparse(url).netloc
+    now = time.monotonic()
+    slot = max(now, _host_next_slot.get(host, 0.0))
+    _host_next_slot[host] = slot + HOST_MIN_INTERVAL
+    if slot > now:
+        await asyncio.sleep(slot - now)
+
+def feed_entry_text(entry: dict) -> str:
+    # Full article body when the feed already ships it (content:encoded), else ""
+    html = (entry.get("content") or [{}])[0].get("value") or entry.get("summary") or ""
+    if len(html) < FEED_CONTENT_MIN_CHARS:
+        return ""
+    text = BeautifulSoup(html, "lxml").get_text(" ", strip=True)
+    return text if len(text) >= FEED_CONTENT_MIN_CHARS else ""
+
+def parse_article(html: str, url: str) -> Tuple[str,str]:
+    text = trafilatura.extract(html, url=url, include_comments=False, include_tables=False) or ""
+    metadata = extract_metadata(html)
+    title = (metadata.title if metadata else None) or url
+    return title, text
+
+async def extract_article_text(session: aiohttp.ClientSession, url: str, timeout: int = 10) -> Tuple[str,str]:
     # Returns (title, text)
     try:
-        art = Article(url)
-        art.download()
-        art.parse()
-        text = art.text
-        title = art.title or url
-        return title, text
+        await wait_for_host(url)
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+            resp.raise_for_status()
+            html = await resp.text(errors="replace")
+        return await asyncio.get_running_loop().run_in_executor(None, parse_article, html, url)
     except Exception as e:
         print(f"[extract] failed for {url}: {e}")
         return "", ""
-    
-def safe_summarize_hf(text: str) -> str:
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    # Chunks of at most max_chars, cut at the last sentence boundary when possible.
+    # str.rfind does the scanning in C, so this stays cheap on long articles.
+    chunks = []
+    start, n = 0, len(text)
+    while n - start > max_chars:
+        end = start + max_chars
+        cut = max(text.rfind(sep, start, end) for sep in (". ", "! ", "? ", "\n"))
+        cut = cut + 1 if cut > start else end
+        chunks.append(text[start:cut])
+        start = cut
+    chunks.append(text[start:])
+    return [ch.strip() for ch in chunks if ch.strip()]
+
+_hf_local = threading.local()
+
+def get_hf_session() -> requests.Session:
+    # Keep-alive session so HF calls reuse a warm TCP/TLS connection;
+    # one per worker thread since requests.Session is not thread-safe
+    session = getattr(_hf_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        if HF_API_TOKEN:
+            session.headers.update({"Authorization": f"Bearer {HF_API_TOKEN}"})
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        _hf_local.session = session
+    return session
+
+def _hf_map(executor: Executor, texts: List[str]) -> List[Optional[str]]:
+    # Send texts in batches of HF_BATCH_SIZE, keeping a few requests in flight
+    batches = [texts[i:i+HF_BATCH_SIZE] for i in range(0, len(texts), HF_BATCH_SIZE)]
+    results = list(executor.map(summarize_hf_api_batch, batches))
+    return [summary for batch in results for summary in batch]
+
+def safe_summarize_hf_batch(texts: List[str]) -> List[Optional[str]]:
+    # None marks texts for which no chunk could be summarized
     MAX_CHARS = 3000
-    if len(text) > MAX_CHARS:
-        parts = [text[i:i+MAX_CHARS] for i in range(0, len(text), MAX_CHARS)]
-        summaries = []
-        for p in parts:
-            try:
-                summaries.append(summarize_hf_api(p))
-            except Exception as e:
-                print(f"⚠️  Partial summarization failed: {e}")
-                summaries.append("")
-        merged = "\n".join([s for s in summaries if s.strip()])
-        return summarize_hf_api(merged) if merged else "[Summary unavailable]"
-    else:
-        try:
-            return summarize_hf_api(text)
-        except Exception as e:
-            print(f"⚠️  Summarization failed: {e}")
-            return "[Summary unavailable]"
+    # Map: summarize every chunk of every text in as few requests as possible
+    parts, owners = [], []
+    for idx, text in enumerate(texts):
+        for part in split_text(text, MAX_CHARS):
+            parts.append(part)
+            owners.append(idx)
+
+    # One pool for both passes, so each worker's session stays warm
+    with ThreadPoolExecutor(max_workers=HF_CONCURRENCY) as executor:
+        chunk_summaries = [[] for _ in texts]
+        for idx, summary in zip(owners, _hf_map(executor, parts)):
+            chunk_summaries[idx].append(summary)
+
+        results = [None] * len(texts)
+        to_reduce = []
+        for idx, summaries in enumerate(chunk_summaries):
+            # Failed chunks come back as None and are left out
+            kept = [s for s in summaries if s and s.strip()]
+            if not kept:
+                continue
+            merged = "\n\n".join(kept)
+            if len(kept) <= 3 or len(merged) <= MAX_CHARS:
+                # The chunk summaries are short enough to read as-is
+                results[idx] = merged
+            else:
+                results[idx] = merged  # kept if the reduce pass fails
+                to_reduce.append((idx, merged))
+
+        # Reduce: re-summarize only when the merged chunk summaries are still too long
+        if to_reduce:
+            reduced = _hf_map(executor, [merged for _, merged in to_reduce])
+            for (idx, _), summary in zip(to_reduce, reduced):
+                if summary:
+                    results[idx] = summary
+    return results
+
+def safe_summarize_hf(text: str) -> str:
+    return safe_summarize_hf_batch([text])[0] or "[Summary unavailable]"
 
 
+@functools.lru_cache(maxsize=1)
+def _get_summarizer():
+    # lazy-load transformers once per process
+    import torch
+    from transformers import pipeline
+    use_cuda = torch.cuda.is_available()
+    summarizer = pipeline("summarization", model=HF_SUMMARIZER_MODEL, truncation=True,
+                          device=0 if use_cuda else -1,
+                          torch_dtype=torch.float16 if use_cuda and QUANTIZE_LOCAL_MODEL else None)
+    if QUANTIZE_LOCAL_MODEL and not use_cuda:
+        # int8 weights for the Linear layers: less memory traffic per decoded token
+        summarizer.model = torch.quantization.quantize_dynamic(
+            summarizer.model, {torch.nn.Linear}, dtype=torch.qint8)
+    return summarizer
+
 def summarize_local(text: str) -> str:
-    # lazy-load transformers
-    from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-    # Use a lightweight summarization model
-    model_name = "sshleifer/distilbart-cnn-12-6"
-    summarizer = pipeline("summarization", model=model_name, truncation=True)
+    summarizer = _get_summarizer()
     # chunk if long
     max_chunk = 1000
-    chunks = [text[i:i+max_chunk] for i in range(0, len(text), max_chunk)]
-    parts = []
-    for ch in chunks:
-        out = summarizer(ch, max_length=SUMMARY_MAX_TOKENS, min_length=30, do_sample=False)
-        parts.append(out[0]['summary_text'].strip())
-    return " ".join(parts)
+    chunks = split_text(text, max_chunk)
+    outs = summarizer(chunks, batch_size=8, max_length=SUMMARY_MAX_TOKENS, min_length=30, do_sample=False)
+    return " ".join(out['summary_text'].strip() for out in outs)
 
-def summarize_hf_api(text: str, max_retries: int = 3) -> str:
-    API_URL = f"https://router.huggingface.co/hf-inference/models/{HF_SUMMARIZER_MODEL}"
-    headers = {"Authorization": f"Bearer {HF_API_TOKEN}"} if HF_API_TOKEN else {}
-    payload = {"inputs": text[:3000], "parameters": {"max_new_tokens": 120, "min_length": 30}}
+def _parse_hf_item(item) -> Optional[str]:
+    if isinstance(item, list) and item:
+        item = item[0]
+    if isinstance(item, dict):
+        return item.get("summary_text") or item.get("generated_text") or None
+    return None
+
+def summarize_hf_api_batch(texts: List[str], max_retries: int = 3) -> List[Optional[str]]:
+    # Returns one summary per input text, in the same order; None where summarization failed
+    payload = {"inputs": [t[:3000] for t in texts], "parameters": {"max_new_tokens": 120, "min_length": 30}}
 
     for attempt in range(max_retries):
         try:
-            resp = requests.post(API_URL, headers=headers, json=payload, timeout=(5, 30))
+            resp = get_hf_session().post(HF_API_URL, json=payload, timeout=(5, 30 + 10 * len(texts)))
             resp.raise_for_status()
             data = resp.json()
-            if isinstance(data, list) and isinstance(data[0], dict):
-                return data[0].get("summary_text") or data[0].get("generated_text", "")
-            elif isinstance(data, dict):
+            if isinstance(data, dict):
                 if data.get("error"):
                     print(f"HF error: {data['error']}")
-                    return textwrap.shorten(text, width=400)
-                return data.get("summary_text", str(data))
-            return str(data)
+                    return [None] * len(texts)
+                data = [data]
+            if isinstance(data, list) and len(data) == len(texts):
+                return [_parse_hf_item(item) for item in data]
+            print(f"⚠️  HF API returned unexpected response for {len(texts)} inputs: {str(data)[:200]}")
+            break
         except requests.exceptions.ReadTimeout:
             print(f"⚠️  HF API timeout (attempt {attempt+1}/{max_retries}), retrying...")
             time.sleep(5)
@@ -193,15 +411,44 @@ def summarize_hf_api(text: str, max_retries: int = 3) -> str:
             break
 
     print("🚫 Summarization failed after retries, skipping.")
-    return "[Summary unavailable due to API timeout]"
+    return [None] * len(texts)
 
-def summarize(text: str) -> str:
-    if not text.strip():
-        return ""
+def summarize_hf_api(text: str, max_retries: int = 3) -> str:
+    summary = summarize_hf_api_batch([text], max_retries)[0]
+    return summary if summary is not None else "[Summary unavailable due to API timeout]"
+
+def summarize_batch(texts: List[str], conn=None) -> List[str]:
+    # With a DB connection, summaries are cached by content hash across runs
+    results = [""] * len(texts)
+    todo = [i for i, text in enumerate(texts) if text.strip()]
+    if not todo:
+        return results
+    hashes = {}
+    if conn is not None:
+        hashes = {i: text_hash(texts[i]) for i in todo}
+        cached = get_cached_summaries(conn, list(hashes.values()))
+        for i in todo:
+            if hashes[i] in cached:
+                results[i] = cached[hashes[i]]
+        todo = [i for i in todo if hashes[i] not in cached]
+        print(f"Summary cache: {len(hashes) - len(todo)} hits, {len(todo)} misses")
+        if not todo:
+            return results
     if USE_LOCAL_MODEL:
-        return summarize_local(text)
+        summaries = [summarize_local(texts[i]) for i in todo]
     else:
-        return safe_summarize_hf(text)
+        summaries = safe_summarize_hf_batch([texts[i] for i in todo])
+    for i, summary in zip(todo, summaries):
+        results[i] = summary if summary is not None else "[Summary unavailable]"
+    if conn is not None:
+        # Only real model output is cached; failures get retried next run
+        fresh = {hashes[i]: summary for i, summary in zip(todo, summaries) if summary}
+        if fresh:
+            cache_summaries(conn, list(fresh.items()))
+    return results
+
+def summarize(text: str) -> str:
+    return summarize_batch([text])[0]
 
 # ---- Formatter & Delivery ----
 def build_mail_body(digest: dict) -> str:
@@ -215,61 +462,113 @@ def build_mail_body(digest: dict) -> str:
     lines.append("\nEnd of digest.")
     return "\n".join(lines)
 
-def send_email(subject: str, body: str):
+def build_message(subject: str, body: str, to: str = EMAIL_TO) -> MIMEText:
     msg = MIMEText(body)
     msg["Subject"] = subject
     msg["From"] = EMAIL_FROM
-    msg["To"] = EMAIL_TO
-    s = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
-    s.ehlo()
-    if SMTP_PORT == 587:
-        s.starttls()
-    if SMTP_USER and SMTP_PASS:
-        s.login(SMTP_USER, SMTP_PASS)
-    s.send_message(msg)
-    s.quit()
+    msg["To"] = to
+    return msg
+
+def send_messages(msgs: List[MIMEText]):
+    # One connection (and TLS handshake) for all messages; closed even on errors
+    if SMTP_PORT == 465:
+        smtp = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+    else:
+        smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT)
+    with smtp as s:
+        if SMTP_PORT == 587:
+            s.starttls()
+        if SMTP_USER and SMTP_PASS:
+            s.login(SMTP_USER, SMTP_PASS)
+        for msg in msgs:
+            s.send_message(msg)
+
+def send_email(subject: str, body: str):
+    send_messages([build_message(subject, body)])
 
 # ---- Main flow ----
-def collect_and_send():
+async def _fetch_feed_job(session: aiohttp.ClientSession, feed: str, meta: Optional[dict],
+                          parse_executor: Optional[Executor]) -> Tuple[List[dict], Optional[dict]]:
+    try:
+        return await fetch_feed(session, feed, meta, parse_executor=parse_executor)
+    except Exception as e:
+        print("feed fetch failed", feed, e)
+        return [], None
+
+async def collect_and_send():
+    now_iso = datetime.now().isoformat()
     conn = init_db()
+    sent_urls = load_sent_urls(conn)
+    feed_meta = load_feed_meta(conn)
     digest = {cat: [] for cat in FEEDS.keys()}
 
-    for cat, feed_list in FEEDS.items():
-        seen = 0
-        for feed in feed_list:
-            print(f"Fetching feed {cat} from: {feed}") 
-            try:
-                entries = fetch_feed_entries(feed)
-                print(f" -------------> Found {len(entries)} entries")
-            except Exception as e:
-                print("feed fetch failed", feed, e)
-                continue
-            for e in entries:
-                if seen >= MAX_ARTICLES_PER_CATEGORY:
+    connector = aiohttp.TCPConnector(limit=FETCH_CONCURRENCY, limit_per_host=MAX_REQUESTS_PER_HOST)
+    async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": "Mozilla/5.0"}) as session:
+        # Fetch each distinct feed once, concurrently (a feed may serve several categories)
+        unique_feeds = list(dict.fromkeys(feed for feed_list in FEEDS.values() for feed in feed_list))
+        print(f"Fetching {len(unique_feeds)} feeds...")
+        parse_pool = make_parse_pool()
+        try:
+            results = await asyncio.gather(*[_fetch_feed_job(session, feed, feed_meta.get(feed), parse_pool)
+                                             for feed in unique_feeds])
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+        entries_by_feed = {feed: entries for feed, (entries, _) in zip(unique_feeds, results)}
+        save_feed_meta(conn, [(feed, meta) for feed, (_, meta) in zip(unique_feeds, results) if meta])
+
+        # Pick up to MAX_ARTICLES_PER_CATEGORY unsent entries per category
+        candidates = {cat: [] for cat in FEEDS.keys()}
+        for cat, feed_list in FEEDS.items():
+            for feed in feed_list:
+                if len(candidates[cat]) >= MAX_ARTICLES_PER_CATEGORY:
                     break
-                url = e.get("link") or e.get("id") or e.get("href") or None
-                if not url:
-                    continue
-                if was_sent(conn, url):
-                    continue
-                title, text = extract_article_text(url)
-                if not text:
-                    # fallback to summary of description if available
-                    text = e.get("summary") or e.get("description") or ""
-                summary = summarize(text)
-                if not summary:
-                    summary = textwrap.shorten(text, width=300)
-                digest[cat].append({"url": url, "title": title or e.get("title","(no title)"), "summary": summary})
-                mark_sent(conn, url, title or e.get("title",""))
-                seen += 1
-                time.sleep(1)  # polite
-            if seen >= MAX_ARTICLES_PER_CATEGORY:
-                break
+                entries = entries_by_feed[feed]
+                print(f"Feed {cat} from: {feed} -------------> Found {len(entries)} entries")
+                for e in entries:
+                    if len(candidates[cat]) >= MAX_ARTICLES_PER_CATEGORY:
+                        break
+                    url = e.get("link") or e.get("id") or e.get("href") or None
+                    if not url or was_sent(conn, url, sent_urls):
+                        continue
+                    sent_urls.add(url)
+                    candidates[cat].append((url, e))
+
+        # Download article bodies concurrently (rate-limited per host),
+        # unless the feed entry already carries the full text
+        article_jobs = [(cat, url, e) for cat, items in candidates.items() for url, e in items]
+        extracted = [(e.get("title", ""), feed_entry_text(e)) for _, _, e in article_jobs]
+        to_extract = [i for i, (_, text) in enumerate(extracted) if not text]
+        print(f"Extracting {len(to_extract)} articles ({len(article_jobs) - len(to_extract)} with full text in feed)...")
+        downloaded = await asyncio.gather(*[extract_article_text(session, article_jobs[i][1]) for i in to_extract])
+        for i, result in zip(to_extract, downloaded):
+            extracted[i] = result
+
+    texts = []
+    for (cat, url, e), (title, text) in zip(article_jobs, extracted):
+        if not text:
+            # fallback to summary of description if available
+            text = e.get("summary") or e.get("description") or ""
+        texts.append(text)
+
+    print(f"Summarizing {len(texts)} articles...")
+    summaries = summarize_batch(texts, conn)
+
+    sent = []
+    for (cat, url, e), (title, _), text, summary in zip(article_jobs, extracted, texts, summaries):
+        if not summary:
+            summary = textwrap.shorten(text, width=300)
+        digest[cat].append({"url": url, "title": title or e.get("title","(no title)"), "summary": summary})
+        sent.append((url, title or e.get("title","")))
+    mark_sent(conn, sent, now_iso)
 
     body = build_mail_body(digest)
     subject = f"Daily Digest — {datetime.now().date().isoformat()}"
     send_email(subject, body)
+    # Only record articles as sent once the email went out
+    conn.commit()
+    conn.close()
     print("Digest sent.")
 
 if __name__ == "__main__":
-    collect_and_send()
+    asyncio.run(collect_and_send())